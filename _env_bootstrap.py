@@ -0,0 +1,12 @@
+# _env_bootstrap.py
+"""Quiet gRPC/absl logging; imported by main.py before absl or the Gemini SDK load."""
+import os
+
+os.environ.update({
+    "GRPC_VERBOSITY": "ERROR",
+    "GLOG_minloglevel": "2",
+    "GRPC_TRACE": "",
+    "GRPC_ENABLE_FORK_SUPPORT": "0",
+    "GRPC_POLL_STRATEGY": "epoll1",
+    "GRPC_DNS_RESOLVER": "native"
+})
@@ -1,122 +1,331 @@
-import google.generativeai as genai
+import asyncio
+import contextlib
+import hashlib
+import os
+import random
+import re
+import time
+from pathlib import Path
+from typing import List, Optional, TYPE_CHECKING
 from config import Config
 from models import CommitMessage
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
-from rich.console import Console
-from rich.panel import Panel
-from exceptions import APIError
+from message_cache import ResponseCache
+from diff_processor import DiffProcessor
+from console_manager import ConsoleManager
+from exceptions import APIError, DiffTooLargeError
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+    from rich.console import Console
+
+# Config values bound at module level for the fallback and correction paths
+COMMIT_TYPES_SET = Config.COMMIT_TYPES_SET
+COMMIT_TYPES_JOINED = Config.COMMIT_TYPES_JOINED
+COMMIT_SCOPE_RE = Config.COMMIT_SCOPE_RE
+MAX_TITLE_LENGTH = Config.MAX_TITLE_LENGTH
+
+# "<type>[(scope)][!]: <description>" in one pass, for repairing generated titles
+TITLE_HEADER_REGEX = re.compile(r'^([a-z]+)(?:\(([^)]*)\))?(!)?\s*:\s*(.*)$')
+# Whitespace and stray code-fence backticks around a model reply, removed in one pass
+RESPONSE_STRIP_CHARS = " \n\r\t`"
+# First line of a commit message inside a model reply that may carry a preamble
+COMMIT_START_REGEX = re.compile(
+    rf'^(?:{"|".join(Config.COMMIT_TYPES)})(?:\([^)]*\))?!?:', re.MULTILINE
+)
 
 class AIModelManager:
     """Manage AI model operations with precision and care."""
+
+    # Static prompt templates; commit types are substituted once at class creation
+    _DIFF_INPUT = """
+# Git Commit Message Generation Task
+
+## Input: Git Diff
+```diff
+{diff}
+```
+
+"""
+    _SUMMARIES_INPUT = """
+# Git Commit Message Generation Task
+
+## Input: Per-File Change Summaries
+The staged diff spans many files, so each file was summarized separately.
+
+{summaries}
+
+"""
+    _PROMPT_REQUIREMENTS = """## Requirements
+Generate a professional Git commit message following these specific guidelines:
+
+1. **Title Format (Required):**
+   - Must start with one of these types: {commit_types}
+   - Follow format: "<type>[(scope)]: <brief description>"
+   - Scope is optional, must be lowercase letters, numbers, or hyphens only
+   - STRICT Maximum 50 characters - be concise and direct
+   - Focus on the core change, avoid unnecessary words
+   - Use imperative mood (e.g., "add" not "added")
+   - If breaking change, append "!" after type/scope
+   - Examples:
+     * "feat(auth): add JWT support" (with scope)
+     * "feat: add user authentication" (without scope)
+     * "feat(api)!: change auth endpoint" (breaking change)
+
+2. **Description Format (Required if changes are significant):**
+   - Leave one blank line after title
+   - Wrap each line at 72 characters
+   - Explain WHAT changed and WHY (not HOW)
+   - Use bullet points for multiple changes
+   - Include technical details when relevant
+   - Example:
+     "Implement JWT-based authentication to secure API endpoints.
+     This change improves security by validating user sessions
+     and preventing unauthorized access."
+
+3. **Footer Format (Required for references):**
+   - Leave one blank line before footer
+   - Use these prefixes:
+     * "Refs: #<issue-number>" for related issues
+     * "Closes: #<issue-number>" for issues this commit resolves
+     * "BREAKING CHANGE:" for breaking changes
+   - One item per line
+   - Example:
+     "Refs: #123
+     Closes: #456
+     BREAKING CHANGE: API authentication required for all endpoints"
+
+## Output Format
+<type>: <brief description>
+
+<detailed description>
+
+<footer>
+
+**Note:** Return ONLY the formatted commit message without any additional text or code blocks.
+"""
+    # The fixed rules go in the system instruction, a stable prefix of every request;
+    # per-call prompts then only carry the diff (or the per-file summaries)
+    _SYSTEM_INSTRUCTION = _PROMPT_REQUIREMENTS.replace("{commit_types}", COMMIT_TYPES_JOINED)
+    # Templates split around their placeholder: a prompt is head + input + tail
+    _PROMPT_HEAD, _PROMPT_TAIL = _DIFF_INPUT.split("{diff}")
+    _SYNTHESIS_HEAD, _SYNTHESIS_TAIL = _SUMMARIES_INPUT.split("{summaries}")
+    _FILE_SUMMARY_PROMPT = """
+Summarize the following single-file Git diff in at most three short bullet points.
+Describe WHAT changed and, when it is apparent, WHY. Return ONLY the bullet points.
+
+```diff
+{diff}
+```
+"""
+    _FILE_SUMMARY_HEAD, _FILE_SUMMARY_TAIL = _FILE_SUMMARY_PROMPT.split("{diff}")
+
+    # API key the SDK was last configured with; reconfiguring discards its cached clients
+    _configured_api_key = None
+
     def __init__(self, api_key: str):
-        self.console = Console()
         self.model = self._initialize_model(api_key)
+        self._summary_model = None
+        self._speculative_model = None
+        self.cache = ResponseCache(namespace=self._cache_namespace()) if Config.ENABLE_CACHE else None
+
+    @classmethod
+    def _cache_namespace(cls) -> str:
+        """Everything besides the diff that shapes a generated message, for the cache key."""
+        return "\0".join((
+            Config.MODEL_NAME,
+            repr(sorted(Config.GENERATION_CONFIG.items())),
+            cls._SYSTEM_INSTRUCTION,
+            cls._PROMPT_HEAD, cls._PROMPT_TAIL,
+            cls._SYNTHESIS_HEAD, cls._SYNTHESIS_TAIL,
+            cls._FILE_SUMMARY_HEAD, cls._FILE_SUMMARY_TAIL,
+        ))
+
+    @property
+    def console(self) -> "Console":
+        """Shared Rich console, created on first use so plain runs skip the import."""
+        return ConsoleManager.get()
+
+    @property
+    def summary_model(self) -> "genai.GenerativeModel":
+        """Model without the commit message system instruction, used for per-file summaries."""
+        if self._summary_model is None:
+            import google.generativeai as genai
+            self._summary_model = genai.GenerativeModel(
+                model_name=Config.MODEL_NAME,
+                generation_config=Config.GENERATION_CONFIG,
+            )
+        return self._summary_model
+
+    @property
+    def speculative_model(self) -> "genai.GenerativeModel":
+        """Low-temperature copy of the main model, raced against it by _speculative_generate."""
+        if self._speculative_model is None:
+            import google.generativeai as genai
+            self._speculative_model = genai.GenerativeModel(
+                model_name=Config.MODEL_NAME,
+                generation_config={**Config.GENERATION_CONFIG, "temperature": Config.SPECULATIVE_TEMPERATURE},
+                system_instruction=self._SYSTEM_INSTRUCTION,
+            )
+        return self._speculative_model
 
     @staticmethod
-    def _initialize_model(api_key: str) -> genai.GenerativeModel:
+    def _initialize_model(api_key: str) -> "genai.GenerativeModel":
         """Initialize and configure the Gemini AI model."""
         if not api_key or not isinstance(api_key, str) or len(api_key) < 10:
             raise APIError("Invalid API key format. Please check your API key.")
             
+        # Imported here: the SDK pulls in gRPC and protobuf, which dominates CLI start-up
+        import google.generativeai as genai
         try:
-            genai.configure(api_key=api_key)
-            # Validate API key with a simple operation
-            genai.list_models()
+            if AIModelManager._configured_api_key != api_key:
+                genai.configure(api_key=api_key)
+                AIModelManager._configured_api_key = api_key
+            if Config.VALIDATE_API_KEY_ON_STARTUP and not AIModelManager._key_recently_validated(api_key):
+                # list_models() is lazy; fetch the first page to actually hit the API
+                next(iter(genai.list_models()), None)
+                AIModelManager._mark_key_validated(api_key)
             return genai.GenerativeModel(
                 model_name=Config.MODEL_NAME,
                 generation_config=Config.GENERATION_CONFIG,
+                system_instruction=AIModelManager._SYSTEM_INSTRUCTION,
             )
         except Exception as e:
             raise APIError(f"Failed to initialize AI model: {str(e)}")
 
-    def generate_commit_message(self, diff: str) -> CommitMessage:
-        """Generate commit message using the AI model with enhanced error handling and performance."""
-        if not diff:
-            self.console.print("[yellow]No changes detected, using default commit message[/yellow]")
-            return CommitMessage("chore: no changes to commit", "")
-        
-        if len(diff) > 1024 * 1024:  # 1MB
-            raise ValueError("Diff size exceeds 1MB limit. Please make smaller commits.")
+    @staticmethod
+    def _key_marker(api_key: str) -> Path:
+        """Marker file recording that this API key passed validation."""
+        digest = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:8]
+        return Config.CACHE_DIR / f"key_ok_{digest}"
 
-        prompt = self._create_prompt(diff)
+    @staticmethod
+    def _key_recently_validated(api_key: str) -> bool:
+        """Check whether the API key was validated within API_KEY_CHECK_TTL."""
         try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[bold blue]Generating commit message..."),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=self.console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("Generating", total=100)
-
-                progress.update(task, advance=20)
-                chat_session = self.model.start_chat(history=[])
-                progress.update(task, advance=20)
+            age = time.time() - os.path.getmtime(AIModelManager._key_marker(api_key))
+        except OSError:
+            return False
+        return age < Config.API_KEY_CHECK_TTL
 
-                max_retries = 3
-                retry_count = 0
-                last_error = None
-                generated_text = None
+    @staticmethod
+    def _mark_key_validated(api_key: str) -> None:
+        """Record a successful validation; failures here only cost a later re-check."""
+        marker = AIModelManager._key_marker(api_key)
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
 
-                while retry_count <= max_retries:
-                    current_prompt = prompt
-                    if retry_count > 0 and last_error:
-                        # Create specific retry prompt
-                        self.console.print(f"[yellow]Attempt {retry_count}/{max_retries}: Retrying due to error: {last_error}[/yellow]")
-                        retry_prompt_detail = f"The previous attempt failed with the error: '{last_error}'.\n"
-                        if "Title must start with one of" in str(last_error):
-                             retry_prompt_detail += f"Ensure the commit type is one of: {', '.join(Config.COMMIT_TYPES)}.\n"
-                        elif "Title length" in str(last_error):
-                             retry_prompt_detail += f"The title was too long. It MUST be under {Config.MAX_TITLE_LENGTH} characters.\n"
-                        elif "Title must follow format" in str(last_error):
-                             retry_prompt_detail += "Ensure the title format is exactly '<type>: <description>'.\n"
-                        else:
-                             retry_prompt_detail += "Please strictly follow all formatting rules mentioned in the requirements.\n"
+    @staticmethod
+    def _is_auth_error(error: Exception) -> bool:
+        """Check whether an API error means the key was rejected."""
+        from google.api_core import exceptions as google_exceptions
+        if isinstance(error, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)):
+            return True
+        return "API key not valid" in str(error)
 
-                        current_prompt = f"""
-# Previous Attempt Review
+    def generate_commit_message_sync(self, diff: str) -> CommitMessage:
+        """Blocking wrapper around generate_commit_message for synchronous callers."""
+        return asyncio.run(self.generate_commit_message(diff))
 
-The previous attempt to generate a commit message resulted in the following error:
-`{last_error}`
+    async def generate_many(self, diffs: List[str]) -> List[CommitMessage]:
+        """Generate commit messages for several diffs concurrently, in input order."""
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
 
-The generated message was:
-{generated_text}
+        async def generate(diff: str) -> CommitMessage:
+            async with semaphore:
+                return await self.generate_commit_message(diff, show_progress=False)
 
+        return await asyncio.gather(*(generate(d) for d in diffs))
 
-# Correction Task
+    async def generate_commit_message(self, diff: str, show_progress: bool = True) -> CommitMessage:
+        """Generate commit message using the AI model with enhanced error handling and performance."""
+        if not diff:
+            self.console.print("[yellow]No changes detected, using default commit message[/yellow]")
+            return CommitMessage("chore: no changes to commit", "")
 
-Please regenerate the commit message based on the original Git Diff, paying close attention to the formatting requirements, especially the one mentioned in the error.
+        if Config.ENABLE_HEURISTICS:
+            trivial_message = DiffProcessor.classify_trivial(diff)
+            if trivial_message is not None:
+                self.console.print("[green]✓ Mechanical change detected, skipping AI generation.[/green]")
+                self._display_commit_message(trivial_message)
+                return trivial_message
 
-## Original Requirements Reminder (Summary)
-- Format: `<type>[(scope)]: <description>` (Title) + Optional Body + Optional Footer
-- Title: STRICTLY under {Config.MAX_TITLE_LENGTH} chars, imperative mood, starts with a valid type ({', '.join(Config.COMMIT_TYPES)})
-- Scope: Optional, must match pattern {Config.COMMIT_SCOPE_PATTERN} (lowercase letters, numbers, hyphens)
-- Body: Wrap at {Config.MAX_COMMIT_BODY_LENGTH} chars, explain WHAT and WHY.
-- Footer: Use prefixes like `Refs:`, `Closes:`, `BREAKING CHANGE:`.
+        if self.cache is not None:
+            cached_message = self.cache.get(diff)
+            if cached_message is not None:
+                self.console.print("[green]✓ Using cached commit message for this diff.[/green]")
+                self._display_commit_message(cached_message)
+                return cached_message
 
-## Original Input: Git Diff
-```diff
-{diff}
-```
-Output Format
-Return ONLY the corrected commit message.
-"""
-                    import time
-                    time.sleep(1 * retry_count) # Backoff
+        # Drop context lines, binary patches and generated files to cut prompt tokens
+        prompt_diff = DiffProcessor.shrink(diff)
+
+        # Reject oversized diffs before any prompt string is built around them
+        if self._exceeds_size_limit(prompt_diff):
+            raise DiffTooLargeError(f"Diff size exceeds {Config.MAX_DIFF_BYTES // 1024} KB limit. Please make smaller commits.")
+
+        try:
+            with self._generation_status(show_progress):
+                file_diffs = DiffProcessor.split_by_file(prompt_diff)
+                if len(file_diffs) > Config.PARALLEL_FILE_THRESHOLD and len(prompt_diff) > Config.PARALLEL_DIFF_CHARS:
+                    # Summarize files concurrently, then generate the message from the summaries
+                    prompt = await self._create_synthesis_prompt(file_diffs)
+                else:
+                    prompt = self._create_prompt(prompt_diff)
+
+                if Config.SPECULATIVE_GENERATION:
+                    commit_message = await self._speculative_generate(prompt)
+                    if commit_message is not None:
+                        self.console.print("[green]✓ Commit message format validated successfully.[/green]")
+                        if self.cache is not None:
+                            self.cache.set(diff, commit_message)
+                        self._display_commit_message(commit_message)
+                        return commit_message
+
+                max_retries = 3
+                # Network/empty-response retries back off; format retries only send a correction
+                transient_retries = 0
+                format_retries = 0
+                last_error = None
+                generated_text = None
+                # The chat keeps the diff in its history, so corrections need not resend it
+                chat_session = self.model.start_chat(history=[])
+                # Turns that completed cleanly; a failed turn is dropped by restoring these
+                good_history = []
+                current_prompt = prompt
+                transient_failure = False
+
+                while transient_retries <= max_retries and format_retries <= max_retries:
+                    if last_error:
+                        # Each kind of retry has its own budget, so report them separately
+                        if transient_failure:
+                            attempt = f"Transient retry {transient_retries}/{max_retries}"
+                        else:
+                            attempt = f"Format retry {format_retries}/{max_retries}"
+                        self.console.print(f"[yellow]{attempt}: Retrying due to error: {last_error}[/yellow]")
+                    if transient_failure:
+                        # Truncated exponential backoff with full jitter; validation retries need no delay
+                        await asyncio.sleep(random.uniform(
+                            0, min(Config.RETRY_MAX_DELAY, Config.RETRY_BASE_DELAY * (2 ** transient_retries))
+                        ))
 
                     try:
-                        progress.update(task, advance=int(15 / (max_retries + 1))) # Update progress per attempt
-                        response = chat_session.send_message(current_prompt)
-                        progress.update(task, advance=int(15 / (max_retries + 1)))
+                        response_text = await self._send_streaming(chat_session, current_prompt)
 
-                        if not response or not response.text:
+                        if not response_text:
                             last_error = "Received empty response from AI model"
                             generated_text = ""
-                            retry_count += 1
+                            # Drop the empty turn and resend the same message
+                            chat_session.history = good_history
+                            transient_failure = True
+                            transient_retries += 1
                             continue
 
-                        generated_text = response.text.strip().strip('`')
+                        # Fold the reply into the history; raises if the stream ended badly
+                        good_history = list(chat_session.history)
+                        generated_text = self._extract_commit_block(response_text)
 
                         # Try to parse and validate using CommitMessage
                         commit_message = CommitMessage.parse(generated_text)
@@ -128,184 +337,266 @@ Return ONLY the corrected commit message.
                     except ValueError as e:
                         # Handle validation errors
                         last_error = str(e)
-                        retry_count += 1
-                        progress.update(task, advance=int(10 / (max_retries + 1)))
+                        if "Title length" in last_error:
+                            # An over-long title is shortened locally; no need for another round-trip
+                            self.console.print("[yellow]Generated title is too long, shortening it locally.[/yellow]")
+                            break
+                        current_prompt = self._create_correction_prompt(last_error)
+                        transient_failure = False
+                        format_retries += 1
                     except Exception as e:
+                        # A rejected key will not succeed on retry
+                        if self._is_auth_error(e):
+                            raise APIError("Invalid API key. Please check your API key.") from e
                         # Handle communication errors
-                        self.console.print(f"[red]Error during AI communication attempt {retry_count}: {str(e)}[/red]")
-                        if retry_count >= max_retries:
+                        self.console.print(f"[red]Error during AI communication (transient retries used: {transient_retries}/{max_retries}): {str(e)}[/red]")
+                        if transient_retries >= max_retries:
                            raise Exception(f"Failed to generate commit message after multiple retries: {str(e)}") from e
                         last_error = f"AI communication error: {str(e)}"
-                        retry_count += 1
-
-
-                progress.update(task, advance=10) # Final progress update
+                        # The SDK refuses further messages after a broken turn, so drop it
+                        chat_session.history = good_history
+                        transient_failure = True
+                        transient_retries += 1
 
                 # --- Fallback Logic ---
                 if last_error:
-                    self.console.print(f"[bold yellow]Warning:[/bold yellow] AI failed to generate a perfectly formatted message after {max_retries} retries (Last error: {last_error}). Applying automatic corrections...")
-                    # Use the last generated text as base
-                    raw_message = generated_text if generated_text else "chore: fallback due to generation failure"
-                    parts = raw_message.split('\n\n', 2)
-                    title = parts[0].strip()
-                    description = parts[1].strip() if len(parts) > 1 else ""
-                    footer = parts[2].strip() if len(parts) > 2 else ""
-                    original_title = title # Store original title for reference
-
-                    # 1. Try to fix Type and Scope
-                    type_scope = title.split(':')[0]
-                    desc_part = title.split(':', 1)[1].strip() if ':' in title else title
-
-                    # Extract type, scope, and breaking change marker
-                    type_part = type_scope
-                    scope_part = None
-                    has_breaking_change = False
-
-                    # Handle breaking change marker
-                    if '!' in type_scope:
-                        type_scope_parts = type_scope.split('!', 1)
-                        type_part = type_scope_parts[0]
-                        has_breaking_change = True
-                        remaining = type_scope_parts[1]
-                    else:
-                        remaining = type_scope
-
-                    # Handle scope
-                    if '(' in remaining:
-                        if remaining.endswith(')'):
-                            type_scope_parts = remaining.split('(', 1)
-                            type_part = type_part or type_scope_parts[0]
-                            scope_part = type_scope_parts[1][:-1]  # Remove closing ')'
-                            
-                            # Validate and fix scope if needed
-                            if not re.match(Config.COMMIT_SCOPE_PATTERN, scope_part):
-                                self.console.print(f"[yellow]Fallback: Removing invalid scope '({scope_part})'.[/yellow]")
-                                scope_part = None
-                        else:
-                            self.console.print("[yellow]Fallback: Removing malformed scope (missing closing parenthesis).[/yellow]")
-
-                    # Fix type if invalid
-                    if type_part not in Config.COMMIT_TYPES:
-                        self.console.print(f"[yellow]Fallback: Correcting invalid type '{type_part}' to 'chore'.[/yellow]")
-                        type_part = "chore"
-                        # If no ':', description is the entire title
-                        if ':' not in title:
-                            desc_part = title
-
-                    # 2. Ensure space after ':'
-                    if not desc_part.startswith(" ") and ':' in title :
-                        desc_part = desc_part.lstrip() # Remove leading spaces if any
-
-                    # 3. Try to fix Title Length
-                    max_desc_len = Config.MAX_TITLE_LENGTH - len(type_part) - 2 # Account for ':' and space
-                    if len(desc_part) > max_desc_len:
-                        self.console.print(f"[yellow]Fallback: Truncating title description to fit {Config.MAX_TITLE_LENGTH} chars.[/yellow]")
-                        # Try to cut at last space
-                        truncated_desc = desc_part[:max_desc_len].rsplit(' ', 1)[0] if ' ' in desc_part[:max_desc_len] else desc_part[:max_desc_len]
-                        desc_part = truncated_desc
-
-                    # 4. Reconstruct Title
-                    title_parts = [type_part]
-                    if scope_part:
-                        title_parts.append(f"({scope_part})")
-                    if has_breaking_change:
-                        title_parts.append("!")
-                    title = f"{''.join(title_parts)}: {desc_part}".rstrip('.!?') # Remove trailing punctuation
-
-                    # 5. Add notes to description if there are modifications
-                    correction_notes = []
-                    if title != original_title:
-                         correction_notes.append(f"Original AI title: {original_title}")
-                    if correction_notes:
-                         description = "\n\n".join(correction_notes) + (f"\n\n{description}" if description else "")
-
-                    # Create CommitMessage object manually to bypass post_init validation
-                    # since we have already tried to fix it here.
-                    # We don't call parse again.
-                    commit_message = CommitMessage(title=title, description=description, footer=footer)
-                    # Reformat description and footer after fallback
-                    commit_message.description = commit_message._format_description(commit_message.description)
-                    commit_message.footer = commit_message._format_footer(commit_message.footer)
-
+                    if transient_retries > max_retries or format_retries > max_retries:
+                        exhausted = "transient" if transient_retries > max_retries else "format"
+                        self.console.print(f"[bold yellow]Warning:[/bold yellow] AI failed to generate a perfectly formatted message after {max_retries} {exhausted} retries (Last error: {last_error}). Applying automatic corrections...")
+                    commit_message = self._apply_fallback_corrections(generated_text)
+                elif self.cache is not None:
+                    # Only cache messages that passed validation without fallback corrections
+                    self.cache.set(diff, commit_message)
 
                 # --- End Fallback Logic ---
 
 
                 # Display the generated message
-                self.console.print(Panel(
-                    f"[bold green]Title:[/bold green] {commit_message.title}\n\n" +
-                    (f"[bold green]Description:[/bold green]\n{commit_message.description}\n\n" if commit_message.description else "") +
-                    (f"[bold green]Footer:[/bold green]\n{commit_message.footer}" if commit_message.footer else ""),
-                    title="[bold]Generated Commit Message[/bold]",
-                    border_style="green"
-                ))
-
-                progress.update(task, completed=100)
+                self._display_commit_message(commit_message)
+
                 return commit_message
         except TimeoutError:
             raise Exception("AI model response timed out. Please try again.")
+        except APIError:
+            raise
         except Exception as e:
             # Handle other errors that may occur outside the retry loop
             self.console.print(f"[bold red]An unexpected error occurred: {str(e)}[/bold red]")
             raise Exception(f"Failed to generate commit message: {str(e)}") from e
 
     @staticmethod
-    def _create_prompt(diff: str) -> str:
-        """Create a detailed prompt for the AI model to generate a commit message."""
-        commit_types_str = ', '.join(Config.COMMIT_TYPES)
-        return f"""
-# Git Commit Message Generation Task
+    def _extract_commit_block(text: str) -> str:
+        """Cut any preamble and trailing commentary around the commit message in a model reply."""
+        match = COMMIT_START_REGEX.search(text)
+        if match is None:
+            return text.strip(RESPONSE_STRIP_CHARS)
+        block = text[match.start():]
+        # Anything after a closing code fence is commentary on the message
+        fence = block.find('\n```')
+        if fence != -1:
+            block = block[:fence]
+        return block.strip(RESPONSE_STRIP_CHARS)
 
-## Input: Git Diff
-```diff
-{diff}
-```
-
-## Requirements
-Generate a professional Git commit message following these specific guidelines:
-
-1. **Title Format (Required):**
-   - Must start with one of these types: {commit_types_str}
-   - Follow format: "<type>[(scope)]: <brief description>"
-   - Scope is optional, must be lowercase letters, numbers, or hyphens only
-   - STRICT Maximum 50 characters - be concise and direct
-   - Focus on the core change, avoid unnecessary words
-   - Use imperative mood (e.g., "add" not "added")
-   - If breaking change, append "!" after type/scope
-   - Examples:
-     * "feat(auth): add JWT support" (with scope)
-     * "feat: add user authentication" (without scope)
-     * "feat(api)!: change auth endpoint" (breaking change)
+    @staticmethod
+    async def _send_streaming(chat_session: "genai.ChatSession", prompt: str) -> str:
+        """Send a message on a chat session and return the concatenated streamed text."""
+        response = await chat_session.send_message_async(prompt, stream=True)
+        return await AIModelManager._read_stream(response)
 
-2. **Description Format (Required if changes are significant):**
-   - Leave one blank line after title
-   - Wrap each line at 72 characters
-   - Explain WHAT changed and WHY (not HOW)
-   - Use bullet points for multiple changes
-   - Include technical details when relevant
-   - Example:
-     "Implement JWT-based authentication to secure API endpoints.
-     This change improves security by validating user sessions
-     and preventing unauthorized access."
+    @staticmethod
+    async def _read_stream(response: "genai.types.AsyncGenerateContentResponse") -> str:
+        """Return the concatenated text of a streamed response."""
+        chunks = []
+        async for chunk in response:
+            # A chunk without candidates (e.g. a blocked reply) carries no text
+            if chunk.candidates and chunk.parts:
+                chunks.append(chunk.text)
+        return "".join(chunks)
+
+    async def _speculative_generate(self, prompt: str) -> Optional[CommitMessage]:
+        """
+        Send the prompt to the regular model and to a low-temperature copy at once.
+        Returns the first reply that passes validation, or None if neither does.
+        """
+        async def generate(model: "genai.GenerativeModel") -> str:
+            return await self._read_stream(await model.generate_content_async(prompt, stream=True))
+
+        tasks = [asyncio.create_task(generate(model)) for model in (self.model, self.speculative_model)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    return CommitMessage.parse(self._extract_commit_block(await finished))
+                except Exception:
+                    # Invalid or failed reply; wait for the other one
+                    continue
+            return None
+        finally:
+            for pending in tasks:
+                pending.cancel()
+
+    def _apply_fallback_corrections(self, generated_text: str) -> CommitMessage:
+        """Repair a generated message that failed validation without another API call."""
+        # Use the last generated text as base
+        raw_message = generated_text if generated_text else "chore: fallback due to generation failure"
+        parts = raw_message.split('\n\n', 2)
+        title = parts[0].strip()
+        description = parts[1].strip() if len(parts) > 1 else ""
+        footer = parts[2].strip() if len(parts) > 2 else ""
+        original_title = title # Store original title for reference
+
+        # 1. Try to fix Type and Scope
+        match = TITLE_HEADER_REGEX.match(title)
+        if match:
+            type_part, scope_part, breaking_marker, desc_part = match.groups()
+            has_breaking_change = breaking_marker is not None
+            if scope_part is not None and not COMMIT_SCOPE_RE.match(scope_part):
+                self.console.print(f"[yellow]Fallback: Removing invalid scope '({scope_part})'.[/yellow]")
+                scope_part = None
+        else:
+            # No recognizable header; if there is no ':', the description is the entire title
+            type_scope, separator, desc_part = title.partition(':')
+            desc_part = desc_part.strip() if separator else title
+            type_part, scope_part, has_breaking_change = type_scope.strip(), None, False
+
+        # Fix type if invalid
+        if type_part not in COMMIT_TYPES_SET:
+            self.console.print(f"[yellow]Fallback: Correcting invalid type '{type_part}' to 'chore'.[/yellow]")
+            type_part = "chore"
+
+        # 2. Try to fix Title Length
+        header_len = len(type_part) + (len(scope_part) + 2 if scope_part else 0) + has_breaking_change
+        max_desc_len = MAX_TITLE_LENGTH - header_len - 2 # Account for ':' and space
+        if scope_part and len(desc_part) > max_desc_len and max_desc_len < MAX_TITLE_LENGTH // 2:
+            # A long scope would leave too little of the description; the type alone still fits
+            self.console.print(f"[yellow]Fallback: Removing scope '({scope_part})' to make room for the description.[/yellow]")
+            max_desc_len += len(scope_part) + 2
+            scope_part = None
+        if len(desc_part) > max_desc_len:
+            self.console.print(f"[yellow]Fallback: Truncating title description to fit {MAX_TITLE_LENGTH} chars.[/yellow]")
+            # Try to cut at last space
+            truncated_desc = desc_part[:max_desc_len]
+            desc_part = truncated_desc.rsplit(' ', 1)[0] if ' ' in truncated_desc else truncated_desc
+
+        # 3. Reconstruct Title
+        title_parts = [type_part]
+        if scope_part:
+            title_parts.append(f"({scope_part})")
+        if has_breaking_change:
+            title_parts.append("!")
+        title = f"{''.join(title_parts)}: {desc_part}".rstrip('.!?') # Remove trailing punctuation
+
+        # 4. Add notes to description if there are modifications
+        correction_notes = []
+        if title != original_title:
+             correction_notes.append(f"Original AI title: {original_title}")
+        if correction_notes:
+             description = "\n\n".join(correction_notes) + (f"\n\n{description}" if description else "")
+
+        # Create CommitMessage object manually to bypass post_init validation
+        # since we have already tried to fix it here.
+        # We don't call parse again.
+        commit_message = CommitMessage(title=title, description=description, footer=footer)
+        # Reformat description and footer after fallback
+        commit_message.description = commit_message._format_description(commit_message.description)
+        commit_message.footer = commit_message._format_footer(commit_message.footer)
+        return commit_message
+
+    @contextlib.contextmanager
+    def _generation_status(self, show_progress: bool):
+        """Show a spinner while the model is working; nothing when output is not a terminal."""
+        if not show_progress or not self.console.is_terminal:
+            yield
+            return
+        with self.console.status("[bold blue]Generating commit message...", spinner="dots"):
+            yield
 
-3. **Footer Format (Required for references):**
-   - Leave one blank line before footer
-   - Use these prefixes:
-     * "Refs: #<issue-number>" for related issues
-     * "Closes: #<issue-number>" for issues this commit resolves
-     * "BREAKING CHANGE:" for breaking changes
-   - One item per line
-   - Example:
-     "Refs: #123
-     Closes: #456
-     BREAKING CHANGE: API authentication required for all endpoints"
+    @staticmethod
+    def _exceeds_size_limit(diff: str) -> bool:
+        """Check the UTF-8 size of the diff against Config.MAX_DIFF_BYTES."""
+        # A code point encodes to 1-4 bytes, so only encode when the length is inconclusive
+        if len(diff) > Config.MAX_DIFF_BYTES:
+            return True
+        if len(diff) * 4 <= Config.MAX_DIFF_BYTES:
+            return False
+        return len(diff.encode('utf-8')) > Config.MAX_DIFF_BYTES
+
+    def _display_commit_message(self, commit_message: CommitMessage) -> None:
+        """Display the generated commit message in a panel."""
+        if not self.console.is_terminal:
+            # Redirected output (CI, hooks): print the plain message, skip Rich rendering
+            print(commit_message)
+            return
+
+        from rich.panel import Panel
+        self.console.print(Panel(
+            f"[bold green]Title:[/bold green] {commit_message.title}\n\n" +
+            (f"[bold green]Description:[/bold green]\n{commit_message.description}\n\n" if commit_message.description else "") +
+            (f"[bold green]Footer:[/bold green]\n{commit_message.footer}" if commit_message.footer else ""),
+            title="[bold]Generated Commit Message[/bold]",
+            border_style="green"
+        ))
+
+    @classmethod
+    def _create_prompt(cls, diff: str) -> str:
+        """Create a detailed prompt for the AI model to generate a commit message."""
+        return cls._PROMPT_HEAD + diff + cls._PROMPT_TAIL
 
-## Output Format
-<type>: <brief description>
+    @staticmethod
+    def _create_correction_prompt(error: str) -> str:
+        """Create a follow-up message asking the model to fix its previous answer."""
+        if "Title must start with one of" in error:
+            detail = f"Ensure the commit type is one of: {COMMIT_TYPES_JOINED}."
+        elif "Title must follow format" in error:
+            detail = "Ensure the title format is exactly '<type>: <description>'."
+        else:
+            detail = "Please strictly follow all formatting rules mentioned in the requirements."
 
-<detailed description>
+        return f"""
+# Correction Task
 
-<footer>
+Your previous commit message failed validation with the following error:
+`{error}`
 
-**Note:** Return ONLY the formatted commit message without any additional text or code blocks.
+{detail}
+Regenerate the commit message for the same changes, paying close attention to the requirement mentioned in the error.
+Return ONLY the corrected commit message.
 """
+
+    async def _create_synthesis_prompt(self, file_diffs: List[str]) -> str:
+        """
+        Summarize each file's diff concurrently and build a prompt from the summaries.
+        Files whose summary failed are included as raw diffs; if every summary
+        failed, the regular single-prompt path is used instead.
+        """
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+
+        async def summarize(file_diff: str) -> Optional[str]:
+            async with semaphore:
+                return await self._summarize_file_async(file_diff)
+
+        summaries = await asyncio.gather(*(summarize(f) for f in file_diffs))
+        failed = summaries.count(None)
+        if failed == len(summaries):
+            self.console.print("[yellow]Per-file summaries failed, sending the full diff instead.[/yellow]")
+            return self._create_prompt("".join(file_diffs))
+        if failed:
+            self.console.print(f"[yellow]Could not summarize {failed} file(s), including their diffs instead.[/yellow]")
+        summary_block = "\n\n".join(
+            f"### {DiffProcessor.file_path(file_diff)}\n" + (summary if summary is not None else f"```diff\n{file_diff}```")
+            for file_diff, summary in zip(file_diffs, summaries)
+        )
+        return self._SYNTHESIS_HEAD + summary_block + self._SYNTHESIS_TAIL
+
+    async def _summarize_file_async(self, file_diff: str) -> Optional[str]:
+        """Ask the model for a short summary of a single file's changes; None if it gave none."""
+        try:
+            response = await self.summary_model.generate_content_async(
+                self._FILE_SUMMARY_HEAD + file_diff + self._FILE_SUMMARY_TAIL
+            )
+            # A blocked reply has no text parts (response.text would raise)
+            if not response.candidates or not response.parts:
+                return None
+            return response.text.strip() or None
+        except Exception:
+            # Rate limits and transport errors: the caller falls back to the raw diff
+            return None
@@ -1,6 +1,7 @@
 # config.py
 from pathlib import Path
 import os
+import re
 from typing import Dict, List
 
 class Config:
@@ -8,6 +9,27 @@ class Config:
     # Use platform-independent path for the environment file
     GLOBAL_ENV_PATH = Path(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env.local"))
     MODEL_NAME = "gemini-2.5-pro-exp-03-25"
+    # Probe the API at start-up; otherwise a bad key surfaces on the first request
+    VALIDATE_API_KEY_ON_STARTUP = False
+    # A key that passed the probe is not re-checked within this window
+    API_KEY_CHECK_TTL = 24 * 3600  # seconds
+    # Cache of generated messages, keyed on the staged diff
+    ENABLE_CACHE = True
+    CACHE_DIR = Path.home() / ".cache" / "auto-commit-message"
+    CACHE_TTL = 7 * 86400  # seconds
+    CACHE_SIZE_LIMIT = 16 * 1024 * 1024  # bytes
+    # Answer mechanical changes (lockfiles, renames, whitespace) locally
+    ENABLE_HEURISTICS = True
+    LOCKFILE_NAMES = frozenset({
+        "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock",
+        "Pipfile.lock", "Cargo.lock", "composer.lock", "Gemfile.lock", "go.sum"
+    })
+    # Changes touching only these file types are committed as documentation updates
+    DOC_EXTENSIONS = (".md", ".rst")
+    # Files whose contents are left out of the prompt (matched against the full path)
+    IGNORE_PATTERNS = (
+        "dist/*", "*/dist/*", "*.min.js", "*.min.css", "*.map", "*.svg"
+    )
     GENERATION_CONFIG = {
         "temperature": 0.9,
         "top_p": 1,
@@ -22,9 +44,30 @@ class Config:
     BREAKING_CHANGE_MARKER = "!"
     MAX_COMMIT_BODY_LENGTH = 72
     MAX_TITLE_LENGTH = 50
+    MAX_DIFF_BYTES = 1024 * 1024  # UTF-8 size limit of a diff sent to the model
+    # Staged diffs larger than this are not read at all (before generated files are dropped)
+    MAX_RAW_DIFF_BYTES = 8 * 1024 * 1024
+    # Diffs touching more files than this, and longer than PARALLEL_DIFF_CHARS once shrunk,
+    # are summarized per file concurrently, then combined (one extra request per file)
+    PARALLEL_FILE_THRESHOLD = 8
+    PARALLEL_DIFF_CHARS = 32 * 1024
+    MAX_CONCURRENT_REQUESTS = 8
+    # Backoff between retries after transient API errors (seconds)
+    RETRY_BASE_DELAY = 0.25
+    RETRY_MAX_DELAY = 8.0
+    # Race the first request against a low-temperature one and keep the first valid reply
+    # (doubles the API calls of the first attempt)
+    SPECULATIVE_GENERATION = False
+    SPECULATIVE_TEMPERATURE = 0.3
     COMMIT_SCOPE_PATTERN = r"^[a-z0-9-]+$"
+    # Precomputed forms of the values above for lookups on the generation path
+    COMMIT_SCOPE_RE = re.compile(COMMIT_SCOPE_PATTERN)
+    COMMIT_TYPES_SET = frozenset(COMMIT_TYPES)
+    COMMIT_TYPES_JOINED = ", ".join(COMMIT_TYPES)
     
     LOG_FORMAT = "%(log_color)s%(levelname)-8s%(reset)s │ %(asctime)s │ %(message)s"
+    # Used when stderr is not a terminal (hooks, CI): same layout without color codes
+    LOG_FORMAT_PLAIN = "%(levelname)-8s │ %(asctime)s │ %(message)s"
     LOG_DATE_FORMAT = "%H:%M:%S"
     LOG_COLORS = {
         'DEBUG': 'blue',
@@ -0,0 +1,16 @@
+# console_manager.py
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+class ConsoleManager:
+    """Share a single Rich console across the application"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get() -> "Console":
+        """Return the process-wide console, creating it on first use"""
+        # Console() probes the terminal (isatty, size, color depth); do that once
+        from rich.console import Console
+        return Console()
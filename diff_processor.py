@@ -0,0 +1,183 @@
+# diff_processor.py
+import fnmatch
+import logging
+import os
+import re
+from typing import List, Optional
+from config import Config
+from models import CommitMessage
+
+# Precompile frequently used regex patterns
+FILE_SPLIT_REGEX = re.compile(r'(?=^diff --git )', re.MULTILINE)
+FILE_HEADER_REGEX = re.compile(r'^diff --git a/(.+?) b/(.+)$', re.MULTILINE)
+IGNORE_REGEX = re.compile('|'.join(fnmatch.translate(p) for p in Config.IGNORE_PATTERNS))
+
+logger = logging.getLogger('auto-commit-message')
+
+class DiffProcessor:
+    """Inspect staged diffs before they are sent to the AI model"""
+    @staticmethod
+    def split_by_file(diff: str) -> List[str]:
+        """Split a unified diff into one section per file"""
+        return [section for section in FILE_SPLIT_REGEX.split(diff) if section.strip()]
+
+    @staticmethod
+    def file_path(section: str) -> str:
+        """Return the (new) path of the file a diff section belongs to"""
+        match = FILE_HEADER_REGEX.match(section)
+        return match.group(2) if match else ""
+
+    @staticmethod
+    def shrink(diff: str) -> str:
+        """
+        Drop diff content that adds no signal for a commit message.
+
+        Generated or vendored files (Config.IGNORE_PATTERNS) and binary
+        patches are reduced to a one-line note. Hunks keep their header, the
+        changed lines and only the first and last context line, and runs of
+        blank added or removed lines are collapsed to one.
+
+        Args:
+            diff (str): The staged diff.
+
+        Returns:
+            str: The reduced diff.
+        """
+        shrunk = []
+        for section in DiffProcessor.split_by_file(diff):
+            path = DiffProcessor.file_path(section)
+            header = section.split('\n', 1)[0]
+            if path and DiffProcessor._is_ignored(path):
+                shrunk.append(f"{header}\n(generated or vendored file changed, contents omitted)\n")
+            elif 'GIT binary patch' in section or '\nBinary files ' in section:
+                shrunk.append(f"{header}\nBinary file {path} changed\n")
+            else:
+                shrunk.append(DiffProcessor._strip_context(section))
+        result = ''.join(shrunk)
+        if diff:
+            logger.debug("Diff reduced to %d/%d characters (%.0f%%)", len(result), len(diff), 100 * len(result) / len(diff))
+        return result
+
+    @staticmethod
+    def classify_trivial(diff: str) -> Optional[CommitMessage]:
+        """
+        Recognize mechanical changes that need no AI-generated message:
+        lockfile updates, pure renames, whitespace-only edits and changes
+        limited to documentation files.
+
+        Args:
+            diff (str): The staged diff.
+
+        Returns:
+            Optional[CommitMessage]: A canned commit message, or None when the
+            diff should go to the AI model.
+        """
+        sections = DiffProcessor.split_by_file(diff)
+        if not sections:
+            return None
+        paths = [DiffProcessor.file_path(section) for section in sections]
+        if not all(paths):
+            return None
+        file_list = '\n'.join(f"- {path}" for path in paths)
+
+        if all(os.path.basename(path) in Config.LOCKFILE_NAMES for path in paths):
+            return CommitMessage.parse(f"build: update lockfile\n\n{file_list}")
+
+        renames = [DiffProcessor._pure_rename(section) for section in sections]
+        if all(renames):
+            rename_list = '\n'.join(f"- {old} -> {new}" for old, new in renames)
+            return CommitMessage.parse(f"refactor: rename files\n\n{rename_list}")
+
+        if DiffProcessor._whitespace_only(sections):
+            return CommitMessage.parse(f"style: reformat whitespace\n\n{file_list}")
+
+        if all(path.lower().endswith(Config.DOC_EXTENSIONS) for path in paths):
+            return CommitMessage.parse(f"docs: update documentation\n\n{file_list}")
+
+        return None
+
+    @staticmethod
+    def _is_ignored(path: str) -> bool:
+        """Check whether a path is a lockfile or matches Config.IGNORE_PATTERNS"""
+        return os.path.basename(path) in Config.LOCKFILE_NAMES or IGNORE_REGEX.match(path) is not None
+
+    @staticmethod
+    def _strip_context(section: str) -> str:
+        """Keep file headers, hunk headers, changed lines and the outer context lines of each hunk"""
+        kept = []
+        in_hunk = False
+        hunk_start = False
+        # Context line seen after the last change; kept only if it ends the hunk
+        trailing_context = None
+        for line in section.splitlines():
+            if line.startswith('@@'):
+                if trailing_context is not None:
+                    kept.append(trailing_context)
+                    trailing_context = None
+                in_hunk = hunk_start = True
+                kept.append(line)
+            elif in_hunk:
+                if line.startswith(('+', '-')):
+                    trailing_context = None
+                    # Collapse runs of blank added/removed lines
+                    if not (line in ('+', '-') and kept[-1] == line):
+                        kept.append(line)
+                elif hunk_start:
+                    kept.append(line)
+                else:
+                    trailing_context = line
+                hunk_start = False
+            elif not line.startswith('index '):
+                kept.append(line)
+        if trailing_context is not None:
+            kept.append(trailing_context)
+        return '\n'.join(kept) + '\n'
+
+    @staticmethod
+    def _pure_rename(section: str) -> Optional[tuple[str, str]]:
+        """Return (old, new) paths if the section renames a file without editing it"""
+        old = new = None
+        for line in section.splitlines():
+            if line.startswith('rename from '):
+                old = line[len('rename from '):]
+            elif line.startswith('rename to '):
+                new = line[len('rename to '):]
+            elif line.startswith(('@@', 'Binary files', 'GIT binary patch')):
+                return None
+        return (old, new) if old and new else None
+
+    @staticmethod
+    def _whitespace_only(sections: List[str]) -> bool:
+        """
+        Check whether the changes only touch trailing whitespace or blank lines.
+
+        Each run of removed/added lines must keep the same non-blank lines in
+        the same order once trailing whitespace is ignored. Indentation and
+        whitespace inside a line stay significant, since they can change
+        behaviour (block structure, string literals).
+        """
+        changed = False
+        for section in sections:
+            in_hunk = False
+            removed = []
+            added = []
+            for line in section.splitlines():
+                if not in_hunk and not line.startswith('@@'):
+                    # File headers: new, deleted, renamed or binary files are real changes
+                    if line.startswith(('new file', 'deleted file', 'rename ', 'Binary files', 'GIT binary patch')):
+                        return False
+                elif line.startswith(('-', '+')):
+                    changed = True
+                    content = line[1:].rstrip()
+                    if content:
+                        (removed if line[0] == '-' else added).append(content)
+                elif not line.startswith('\\'):
+                    # A context line or hunk header ends the current run of changes
+                    in_hunk = True
+                    if removed != added:
+                        return False
+                    removed.clear()
+                    added.clear()
+            if not in_hunk or removed != added:
+                return False
+        return changed
@@ -1,4 +1,5 @@
 # env_manager.py
+import functools
 import os
 from typing import Tuple, Optional
 from dotenv import load_dotenv
@@ -8,8 +9,9 @@ from exceptions import EnvError
 class EnvironmentManager:
     """Manage environment configuration"""
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def setup() -> Tuple[bool, Optional[str]]:
-        """Set up environment and return API key"""
+        """Set up environment and return API key (loaded once per process; errors are not cached)"""
         if not Config.GLOBAL_ENV_PATH.exists():
             raise EnvError(f"Environment file not found at {Config.GLOBAL_ENV_PATH}")
 
@@ -3,6 +3,10 @@ class GitError(Exception):
     """Exception raised for Git-related errors"""
     pass
 
+class DiffTooLargeError(GitError):
+    """Exception raised when the staged diff exceeds the configured size limits"""
+    pass
+
 class EnvError(Exception):
     """Exception raised for environment-related errors"""
     pass
@@ -1,20 +1,50 @@
 # git_manager.py
+from __future__ import annotations
+
+import os
 import subprocess
+import tempfile
 import logging
-from typing import Optional, Dict, Any
-from exceptions import GitError
+from typing import TYPE_CHECKING
+from config import Config
+from exceptions import GitError, DiffTooLargeError
+
+if TYPE_CHECKING:
+    from typing import Optional, Dict, List, Tuple
+
+# Read-only git calls skip optional index locks and never prompt for credentials.
+# `git commit` runs with the caller's environment untouched, since hooks inherit it.
+_READ_ONLY_GIT_ENV = {"GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
 
 class GitCommitManager:
     """Manage Git operations"""
     def __init__(self, logger: logging.Logger):
         self.logger = logger
+        self._prereq_ok: Optional[bool] = None
+        self._read_only_env: Optional[Dict[str, str]] = None
+
+    def snapshot_environment(self) -> None:
+        """Build the environment for read-only git calls once; call again after .env is loaded"""
+        self._read_only_env = {**os.environ, **_READ_ONLY_GIT_ENV}
+
+    def _git_env(self) -> Dict[str, str]:
+        """Environment for read-only git calls, built on first use"""
+        if self._read_only_env is None:
+            self.snapshot_environment()
+        return self._read_only_env
 
     def check_prerequisites(self) -> bool:
-        """Check Git installation and repository status"""
+        """Check Git installation and repository status (once per instance)"""
+        if self._prereq_ok is not None:
+            return self._prereq_ok
         try:
-            self._run_git_command(["--version"])
-            self._run_git_command(["rev-parse", "--is-inside-work-tree"])
+            # One rev-parse answers everything: a missing git raises FileNotFoundError,
+            # outside a repository it fails, and inside .git it prints "false"
+            result = self._run_git_command(["rev-parse", "--is-inside-work-tree"], env=self._git_env(), capture_output=True)
+            if result.stdout.strip() != "true":
+                raise GitError("Current directory is not a Git repository")
             self.logger.debug("Git prerequisites check passed")
+            self._prereq_ok = True
             return True
         except subprocess.CalledProcessError:
             raise GitError("Current directory is not a Git repository")
@@ -23,38 +53,79 @@ class GitCommitManager:
 
     def get_diff(self) -> str:
         """Get staged changes from Git with enhanced error handling"""
-        try:
-            result = self._run_git_command(["diff", "--cached", "--no-color"], capture_output=True)
-            diff_output = result.stdout.decode('utf-8').strip() if result.stdout else ""
-            
-            if diff_output:
-                self.logger.debug(f"Successfully retrieved git diff ({len(diff_output)} bytes)")
-                if len(diff_output) > 1024 * 1024:  # 1MB
-                    self.logger.warning("Large diff detected (>1MB). This may impact performance.")
-            else:
-                self.logger.warning("No staged changes found. Please stage your changes using 'git add'")
-                
-            return diff_output
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.decode('utf-8').strip() if e.stderr else str(e)
-            raise GitError(f"Failed to get git diff: {error_msg}")
-        except UnicodeDecodeError as e:
-            raise GitError(f"Failed to decode git diff output: {str(e)}. Please check for binary files.")
+        buffer = self._read_staged_diff()
+        # Undecodable bytes (e.g. Latin-1 sources) are replaced rather than failing the run
+        diff_output = buffer.decode('utf-8', errors='replace').strip() if buffer else ""
+        self._log_diff_size(diff_output, len(buffer))
+        return diff_output
+
+    def get_diff_and_stats(self) -> Tuple[str, Dict[str, int]]:
+        """Get staged changes and their statistics from a single git call"""
+        buffer = self._read_staged_diff(["--numstat", "--patch"])
+        output = buffer.decode('utf-8', errors='replace')
+        # The numstat lines come first, separated from the patch by an empty line
+        numstat, _, patch = output.partition('\n\n')
+        diff_output = patch.strip()
+        self._log_diff_size(diff_output, len(buffer))
+        return diff_output, self._parse_stats(numstat.split('\n'))
+
+    def _log_diff_size(self, diff_output: str, size: int) -> None:
+        """Report the size of the retrieved diff, or that nothing is staged"""
+        if diff_output:
+            self.logger.debug("Successfully retrieved git diff (%d bytes)", size)
+            if size > Config.MAX_DIFF_BYTES:
+                self.logger.warning("Large diff detected (>1MB). This may impact performance.")
+        else:
+            self.logger.warning("No staged changes found. Please stage your changes using 'git add'")
+
+    def _read_staged_diff(self, extra_args: Optional[List[str]] = None, chunk_size: int = 64 * 1024) -> bytearray:
+        """Stream the staged diff, stopping as soon as it exceeds MAX_RAW_DIFF_BYTES"""
+        # stderr goes to a temporary file: a pipe read only after stdout ends would let
+        # git block on a full stderr buffer (e.g. many CRLF warnings) and deadlock
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                ("git", "diff", "--cached", "--no-color", *(extra_args or ())),
+                env=self._git_env(),
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+            )
+            buffer = bytearray()
+            with process:
+                while chunk := process.stdout.read(chunk_size):
+                    buffer += chunk
+                    if len(buffer) > Config.MAX_RAW_DIFF_BYTES:
+                        process.kill()
+                        raise DiffTooLargeError(
+                            f"Staged diff exceeds {Config.MAX_RAW_DIFF_BYTES // 1024} KB limit. Please make smaller commits."
+                        )
+            if process.returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode('utf-8', 'replace').strip()
+                raise GitError(f"Failed to get git diff: Git command failed: {stderr}")
+        return buffer
 
     def get_stats(self) -> Dict[str, int]:
         """Get statistics of staged changes"""
         try:
-            result = self._run_git_command(["diff", "--cached", "--numstat"], capture_output=True)
-            stats_output = result.stdout.decode('utf-8').strip().split('\n')
-            
-            total_files = len([line for line in stats_output if line.strip()])
+            result = self._run_git_command(["diff", "--cached", "--numstat"], env=self._git_env(), capture_output=True)
+        except subprocess.CalledProcessError as e:
+            self.logger.error("Failed to get git stats: %s", e)
+            return {'files_changed': 0, 'insertions': 0, 'deletions': 0}
+        return self._parse_stats(result.stdout.strip().split('\n'))
+
+    def _parse_stats(self, stats_output: List[str]) -> Dict[str, int]:
+        """Sum `git diff --numstat` lines into file, insertion and deletion counts"""
+        try:
+            total_files = 0
             total_insertions = 0
             total_deletions = 0
             
             for line in stats_output:
-                if not line.strip():
+                if not line:
                     continue
-                parts = line.split()
+                total_files += 1
+                # Limit the split so paths containing spaces stay one field
+                parts = line.split(None, 2)
                 if parts[0] == '-' or parts[1] == '-':  # Binary file
                     continue
                 total_insertions += int(parts[0])
@@ -65,8 +136,8 @@ class GitCommitManager:
                 'insertions': total_insertions,
                 'deletions': total_deletions
             }
-        except (subprocess.CalledProcessError, ValueError, IndexError) as e:
-            self.logger.error(f"Failed to get git stats: {str(e)}")
+        except (ValueError, IndexError) as e:
+            self.logger.error("Failed to get git stats: %s", e)
             # Return default values instead of None for consistency
             return {'files_changed': 0, 'insertions': 0, 'deletions': 0}
 
@@ -81,12 +152,17 @@ class GitCommitManager:
 
     @staticmethod
     def _run_git_command(args: list, **kwargs) -> subprocess.CompletedProcess:
-        """Run a Git command with given arguments"""
+        """Run a Git command with given arguments (inherits the process environment unless env is given)"""
+        if kwargs.get('capture_output'):
+            # Decode captured output once, in the C-level text layer
+            kwargs.setdefault('text', True)
+            kwargs.setdefault('encoding', 'utf-8')
+            kwargs.setdefault('errors', 'replace')
         try:
-            return subprocess.run(["git"] + args, **kwargs, check=True)
+            return subprocess.run(("git", *args), check=True, **kwargs)
         except subprocess.CalledProcessError as e:
             # Re-raise with more context
-            error_msg = e.stderr.decode('utf-8').strip() if hasattr(e, 'stderr') and e.stderr else str(e)
+            error_msg = e.stderr.strip() if e.stderr else str(e)
             raise subprocess.CalledProcessError(
                 e.returncode, 
                 e.cmd, 
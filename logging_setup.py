@@ -1,29 +1,47 @@
 import logging
+import sys
 import colorlog
 from config import Config
 
-class CustomFormatter(colorlog.ColoredFormatter):
-    """Custom formatter for consistent log level with emoji indicators"""
+class EmojiPrefixMixin:
+    """Prefix log messages with the emoji indicator of their level"""
     def format(self, record):
-        # Add emoji indicator based on log level
-        record.msg = f"{Config.LOG_STYLES.get(record.levelname, '')} {record.msg}"
+        # Add emoji indicator based on log level, on a copy so other handlers see the original record
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = Config.LOG_STYLES.get(record.levelname, '') + " " + record.getMessage()
+        record.args = None
         return super().format(record)
 
+class CustomFormatter(EmojiPrefixMixin, colorlog.ColoredFormatter):
+    """Custom formatter for consistent log level with emoji indicators"""
+
+class PlainFormatter(EmojiPrefixMixin, logging.Formatter):
+    """Emoji-prefixed formatter without color codes, for non-terminal output"""
+
 class LoggerSetup:
     """Setup logging configuration"""
     @staticmethod
     def setup() -> logging.Logger:
-        """Configure and return logger with colored output"""
-        handler = colorlog.StreamHandler()
-        handler.setFormatter(CustomFormatter(
-            Config.LOG_FORMAT,
-            datefmt=Config.LOG_DATE_FORMAT,
-            log_colors=Config.LOG_COLORS
-        ))
-
+        """Configure and return logger with colored output (plain when stderr is not a terminal)"""
         logger = logging.getLogger('auto-commit-message')
+        # Later calls reuse the handler and formatter installed by the first one
+        if getattr(logger, "_configured", False):
+            return logger
+
+        if sys.stderr.isatty():
+            handler = colorlog.StreamHandler()
+            handler.setFormatter(CustomFormatter(
+                Config.LOG_FORMAT,
+                datefmt=Config.LOG_DATE_FORMAT,
+                log_colors=Config.LOG_COLORS
+            ))
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(PlainFormatter(Config.LOG_FORMAT_PLAIN, datefmt=Config.LOG_DATE_FORMAT))
+
         logger.setLevel(logging.DEBUG)
-        logger.handlers = []  # Clear existing handlers
+        logger.handlers.clear()  # Clear existing handlers
         logger.addHandler(handler)
+        logger._configured = True
 
         return logger
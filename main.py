@@ -1,50 +1,44 @@
-# Initialize absl logging first
+# Must stay the first import: gRPC and absl read these variables when they load
+import _env_bootstrap
+
 from absl import logging as absl_logging
 absl_logging.set_verbosity(absl_logging.ERROR)
 
 import os
-
-# Set logging environment variables early
-os.environ.update({
-    "GRPC_VERBOSITY": "ERROR",
-    "GLOG_minloglevel": "2",
-    "GRPC_TRACE": "",
-    "GRPC_ENABLE_FORK_SUPPORT": "0",
-    "GRPC_POLL_STRATEGY": "epoll1",
-    "GRPC_DNS_RESOLVER": "native"
-})
-
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import logging_setup
 import env_manager
 import git_manager
-import ai_manager
 from exceptions import GitError, EnvError, APIError
 
 def main():
     """Main function orchestrating the commit message generation process"""
     logger = logging_setup.LoggerSetup.setup()
-    logger.debug(f"Working directory: {os.getcwd()}")
+    logger.debug("Working directory: %s", os.getcwd())
 
     try:
         logger.debug("Setting up environment")
-        _, api_key = env_manager.EnvironmentManager.setup()
+        git_manager_instance = git_manager.GitCommitManager(logger)
+        # Independent start-up checks run concurrently: one reads a file, the other runs git
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            env_future = executor.submit(env_manager.EnvironmentManager.setup)
+            git_future = executor.submit(git_manager_instance.check_prerequisites)
+
+            _, api_key = env_future.result()
+            # Later git reads reuse one environment that includes the .env variables
+            git_manager_instance.snapshot_environment()
+
+            try:
+                git_future.result()
+            except GitError as e:
+                logger.critical(str(e))
+                sys.exit(1)
 
-        try:
-            git_manager_instance = git_manager.GitCommitManager(logger)
-            git_manager_instance.check_prerequisites()
-        except GitError as e:
-            logger.critical(str(e))
-            sys.exit(1)
-            
-        try:
-            ai_manager_instance = ai_manager.AIModelManager(api_key)
-        except APIError as e:
-            logger.critical(f"API Error: {str(e)}")
-            sys.exit(1)
 
         try:
-            diff = git_manager_instance.get_diff()
+            # Patch and numstat come from one git call; the stats are shown before confirming
+            diff, stats = git_manager_instance.get_diff_and_stats()
             if not diff:
                 logger.warning("No staged changes found. Use 'git add <files>' first")
                 sys.exit(0)
@@ -52,38 +46,61 @@ def main():
             logger.critical(str(e))
             sys.exit(1)
 
+        # Imported only once there is something to commit: it pulls in the Gemini SDK
+        import ai_manager
+        try:
+            ai_manager_instance = ai_manager.AIModelManager(api_key)
+        except APIError as e:
+            logger.critical("API Error: %s", e)
+            sys.exit(1)
+
         logger.info("Generating commit message...")
         try:
-            commit_message = ai_manager_instance.generate_commit_message(diff)
+            commit_message = ai_manager_instance.generate_commit_message_sync(diff)
         except APIError as e:
-            logger.critical(f"Failed to generate commit message: {str(e)}")
+            logger.critical("Failed to generate commit message: %s", e)
             sys.exit(1)
         
-        from rich.prompt import Confirm
-        from rich.console import Console
-        from rich.panel import Panel
-        from rich.style import Style
-        
-        console = Console()
-        
-        # Tampilkan statistik perubahan
-        stats = git_manager_instance.get_stats()
-        console.print(Panel(
-            f"[bold blue]Files Changed:[/bold blue] {stats['files_changed']}\n" +
-            f"[bold green]Insertions:[/bold green] +{stats['insertions']}\n" +
-            f"[bold red]Deletions:[/bold red] -{stats['deletions']}",
-            title="[bold]Commit Statistics[/bold]",
-            border_style="blue"
-        ))
-        
-        # Tampilkan dialog konfirmasi yang lebih menarik
-        if not Confirm.ask(
-            "[bold yellow]Proceed with this commit?[/bold yellow]",
-            default=True,
-            show_default=True
-        ):
-            console.print("[yellow]Commit canceled by user[/yellow]")
-            sys.exit(0)
+        # AUTO_COMMIT_YES=1 skips the confirmation (CI, hooks); plain output when not on a terminal
+        assume_yes = os.environ.get("AUTO_COMMIT_YES") == "1"
+        if assume_yes or not sys.stdout.isatty():
+            print(f"Files changed: {stats['files_changed']}, +{stats['insertions']}/-{stats['deletions']}")
+            if not assume_yes:
+                try:
+                    answer = input("Proceed with this commit? [Y/n] ")
+                except EOFError:
+                    # Closed or empty stdin (CI): nobody can confirm, so treat it as a cancel
+                    print("\nCommit canceled: no input to confirm it. Set AUTO_COMMIT_YES=1 to commit without confirmation.")
+                    sys.exit(0)
+                if answer.strip().lower() not in ("", "y", "yes"):
+                    print("Commit canceled by user")
+                    sys.exit(0)
+        else:
+            from rich.prompt import Confirm
+            from rich.panel import Panel
+            from console_manager import ConsoleManager
+            
+            # Same console the generation output used; no second terminal probe
+            console = ConsoleManager.get()
+            
+            # Tampilkan statistik perubahan
+            console.print(Panel(
+                f"[bold blue]Files Changed:[/bold blue] {stats['files_changed']}\n" +
+                f"[bold green]Insertions:[/bold green] +{stats['insertions']}\n" +
+                f"[bold red]Deletions:[/bold red] -{stats['deletions']}",
+                title="[bold]Commit Statistics[/bold]",
+                border_style="blue"
+            ))
+            
+            # Tampilkan dialog konfirmasi yang lebih menarik
+            if not Confirm.ask(
+                "[bold yellow]Proceed with this commit?[/bold yellow]",
+                default=True,
+                show_default=True,
+                console=console
+            ):
+                console.print("[yellow]Commit canceled by user[/yellow]")
+                sys.exit(0)
         
         if not git_manager_instance.commit(commit_message):
             sys.exit(1)
@@ -92,7 +109,7 @@ def main():
         logger.critical(str(e))
         sys.exit(1)
     except Exception as e:
-        logger.critical(f"Unexpected error occurred: {str(e)}")
+        logger.critical("Unexpected error occurred: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+# message_cache.py
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Optional
+import diskcache
+from config import Config
+from models import CommitMessage
+
+logger = logging.getLogger('auto-commit-message')
+
+# Failures of the on-disk store (unwritable directory, corrupt database, lock timeouts)
+CACHE_ERRORS = (OSError, sqlite3.Error, diskcache.Timeout)
+
+class ResponseCache:
+    """
+    Persistent cache of generated commit messages keyed on the staged diff.
+
+    The cache is best-effort: if the store cannot be opened or read, it is
+    disabled for the rest of the run and every lookup is a miss.
+    """
+    def __init__(self, namespace: str = "", directory: Path = Config.CACHE_DIR, ttl: int = Config.CACHE_TTL):
+        # Messages generated under a different model or prompt must not be served
+        self._namespace = hashlib.sha256(namespace.encode('utf-8')).digest()
+        self.ttl = ttl
+        try:
+            # Least-recently-stored entries are evicted once the size limit is reached
+            self._cache = diskcache.Cache(str(directory), size_limit=Config.CACHE_SIZE_LIMIT)
+        except CACHE_ERRORS as e:
+            self._disable(e)
+
+    def _disable(self, error: Exception) -> None:
+        """Turn the cache off after a storage error"""
+        logger.warning("Commit message cache disabled: %s", error)
+        self._cache = None
+
+    def make_key(self, diff: str) -> str:
+        """Return the cache key for a diff (SHA-256 of the namespace and the normalized diff)"""
+        return hashlib.sha256(self._namespace + diff.strip().encode('utf-8')).hexdigest()
+
+    def get(self, diff: str) -> Optional[CommitMessage]:
+        """Return the cached commit message for a diff, or None on a miss"""
+        if self._cache is None:
+            return None
+        try:
+            value = self._cache.get(self.make_key(diff))
+        except CACHE_ERRORS as e:
+            self._disable(e)
+            return None
+        # Entries written before the footer was stored are treated as misses
+        if value is None or len(value) != 4:
+            return None
+        title, description, footer, is_breaking_change = value
+        commit_message = CommitMessage(title=title, description=description, footer=footer)
+        commit_message.is_breaking_change = is_breaking_change
+        return commit_message
+
+    def set(self, diff: str, commit_message: CommitMessage) -> None:
+        """Store a validated commit message for a diff"""
+        if self._cache is None:
+            return
+        try:
+            self._cache.set(
+                self.make_key(diff),
+                (commit_message.title, commit_message.description,
+                 commit_message.footer, commit_message.is_breaking_change),
+                expire=self.ttl
+            )
+        except CACHE_ERRORS as e:
+            self._disable(e)
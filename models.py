@@ -2,21 +2,52 @@
 
 from enum import Enum
 from dataclasses import dataclass, field
+import functools
 import re
+import sys
 import textwrap
 from config import Config  # Ensure that config.py is importable
 
 # Cache configuration for performance and clarity
 COMMIT_TYPES = Config.COMMIT_TYPES
+COMMIT_TYPES_SET = Config.COMMIT_TYPES_SET
+COMMIT_TYPES_JOINED = Config.COMMIT_TYPES_JOINED
 COMMIT_SCOPE_PATTERN = Config.COMMIT_SCOPE_PATTERN
 MAX_TITLE_LENGTH = Config.MAX_TITLE_LENGTH
 MAX_COMMIT_BODY_LENGTH = Config.MAX_COMMIT_BODY_LENGTH
 
 # Precompile frequently used regex patterns
 HEADER_WITH_SCOPE_REGEX = re.compile(r"^([a-z]+)\((.+)\)$")
-LIST_ITEM_REGEX = re.compile(r'^([-*•]|\d+\.|[a-zA-Z]\.)\s+(.+)$')
-
-class CommitMessageError(Exception):
+# List markers ("-", "*", "•", "1.", "a.") share one anchored alternation and whitespace suffix
+LIST_MARKER_PATTERN = r'[-*•]|\d+\.|[a-zA-Z]\.'
+LIST_ITEM_REGEX = re.compile(rf'^({LIST_MARKER_PATTERN})\s+(.+)$')
+# Bound methods of compiled patterns used once per title / footer line
+SCOPE_FULLMATCH = re.compile(COMMIT_SCOPE_PATTERN).fullmatch
+LEADING_LIST_MARKER = re.compile(rf'^(?:{LIST_MARKER_PATTERN})\s+').sub
+# Splits on blank lines, treating any run of them as one separator
+SECTION_SPLIT = re.compile(r'\n{2,}').split
+
+# Instances carry no per-object __dict__ where dataclass slots are available (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Shared wrappers: TextWrapper setup and its word-splitting regexes are built once
+_WRAPPER_OPTIONS = dict(
+    replace_whitespace=False,
+    drop_whitespace=True,
+    break_long_words=True,  # Changed to True to prevent truncation
+    break_on_hyphens=True,
+    expand_tabs=True,
+)
+PARAGRAPH_WRAPPER = textwrap.TextWrapper(width=MAX_COMMIT_BODY_LENGTH, **_WRAPPER_OPTIONS)
+
+@functools.lru_cache(maxsize=None)
+def list_item_wrapper(indent: str) -> textwrap.TextWrapper:
+    """Wrapper for list items whose continuation lines align under the marker's text."""
+    return textwrap.TextWrapper(
+        width=MAX_COMMIT_BODY_LENGTH - len(indent), subsequent_indent=indent, **_WRAPPER_OPTIONS
+    )
+
+class CommitMessageError(ValueError):
     """Custom exception for commit message validation errors."""
     pass
 
@@ -35,7 +66,7 @@ class CommitType(Enum):
     TEST = "test"
     SECURITY = "security"
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CommitMessage:
     """
     Represents a formatted commit message with structured sections.
@@ -47,10 +78,12 @@ class CommitMessage:
     is_breaking_change: bool = field(init=False, default=False)
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _validate_and_format_title(raw_title: str) -> tuple[str, bool]:
         """
         Validates the raw title against Conventional Commit rules and formats it.
         Ensures the title is not truncated and maintains readability.
+        Results are memoized per raw title; invalid titles raise on every call.
         
         Args:
             raw_title (str): The raw commit title.
@@ -61,25 +94,26 @@ class CommitMessage:
         Raises:
             CommitMessageError: If the title format is invalid.
         """
-        title = raw_title.strip()
-        if ":" not in title:
+        # One scan finds the separator and yields both sides
+        header, separator, description = raw_title.partition(":")
+        if not separator:
             raise CommitMessageError("Validation error: Title must include ':' to separate type and description.")
 
-        parts = title.split(":", 1)
-        header = parts[0].strip()    # Contains type, optional scope, optional '!'
-        description = parts[1].strip()
+        header = header.strip()    # Contains type, optional scope, optional '!'
+        description = description.strip()
         if not description:
             raise CommitMessageError("Validation error: Description after ':' cannot be empty.")
 
         # Capitalize the first letter of the description if necessary
-        if description[0].islower():
-            description = description[0].upper() + description[1:]
+        if description[:1].islower():
+            description = description[:1].upper() + description[1:]
 
         # Check for breaking change marker '!' before the colon
         is_breaking = False
-        if header.endswith("!"):
+        if header[-1:] == "!":
             is_breaking = True
-            header = header[:-1].strip()
+            # The header is already stripped; only a space before '!' can remain
+            header = header[:-1].rstrip()
             if not header:
                 raise CommitMessageError("Validation error: '!' for breaking change cannot be the only character before ':'")
 
@@ -92,7 +126,7 @@ class CommitMessage:
             scope_part = match.group(2)
             if not scope_part:
                 raise CommitMessageError("Validation error: Scope cannot be empty when using parentheses.")
-            if not re.fullmatch(COMMIT_SCOPE_PATTERN, scope_part):
+            if not SCOPE_FULLMATCH(scope_part):
                 raise CommitMessageError(
                     f"Validation error: Scope '({scope_part})' contains invalid characters. Allowed pattern: {COMMIT_SCOPE_PATTERN}"
                 )
@@ -100,28 +134,23 @@ class CommitMessage:
             raise CommitMessageError("Validation error: Invalid scope format. Use 'type(scope)' or just 'type'.")
 
         # Validate type
-        if type_part not in COMMIT_TYPES:
-            if type_part.lower() in COMMIT_TYPES:
+        if type_part not in COMMIT_TYPES_SET:
+            if type_part.lower() in COMMIT_TYPES_SET:
                 raise CommitMessageError(f"Validation error: Type '{type_part}' must be in lowercase. Did you mean '{type_part.lower()}'?")
             else:
-                allowed = ', '.join(COMMIT_TYPES)
-                raise CommitMessageError(f"Validation error: Type '{type_part}' is not valid. It must be one of: {allowed}")
+                raise CommitMessageError(f"Validation error: Type '{type_part}' is not valid. It must be one of: {COMMIT_TYPES_JOINED}")
 
         # Reconstruct header (include '!' if breaking change)
-        final_header = type_part
-        if scope_part:
-            final_header += f"({scope_part})"
-        if is_breaking:
-            final_header += "!"
+        breaking_marker = "!" if is_breaking else ""
+        final_header = f"{type_part}({scope_part}){breaking_marker}" if scope_part else type_part + breaking_marker
 
         # Remove trailing period from the description (unless it is ellipsis '...')
-        if description.endswith('.') and not description.endswith('...'):
+        if description[-1] == '.' and description[-3:] != '...':
             description = description[:-1]
-        # Ensure proper capitalization of description
-        if description[0].islower():
-            description = description[0].upper() + description[1:]
+            if not description:
+                raise CommitMessageError("Validation error: Description after ':' cannot be empty.")
 
-        final_title = f"{final_header}: {description}"
+        final_title = final_header + ": " + description
 
         # Check title length and raise error if too long
         if len(final_title) > MAX_TITLE_LENGTH:
@@ -145,62 +174,34 @@ class CommitMessage:
         if not text_block:
             return ""
         
-        # Normalize newlines and remove excessive blank lines
-        text_block = re.sub(r'\n{3,}', '\n\n', text_block.strip())
-        paragraphs = text_block.split('\n\n')
-        wrapped_paragraphs = []
-
-        for paragraph in paragraphs:
-            lines = paragraph.strip().split('\n')
-            wrapped_lines = []
-            
-            for line in lines:
-                list_match = LIST_ITEM_REGEX.match(line)
-                if list_match:
-                    marker = list_match.group(1)
-                    content = list_match.group(2)
-                    indent = ' ' * (len(marker) + 1)
-                    wrap_width = MAX_COMMIT_BODY_LENGTH - len(indent)
-                    
-                    # Preserve long words by allowing them to exceed the wrap width
-                    wrapped = textwrap.wrap(
-                        content,
-                        width=wrap_width,
-                        replace_whitespace=False,
-                        drop_whitespace=True,
-                        break_long_words=True,  # Changed to True to prevent truncation
-                        break_on_hyphens=True,
-                        expand_tabs=True,
-                        initial_indent='',
-                        subsequent_indent=indent
-                    )
-                    
-                    if wrapped:
-                        wrapped_lines.append(f"{marker} {wrapped[0]}")
-                        wrapped_lines.extend(indent + line for line in wrapped[1:])
-                else:
-                    # Handle regular paragraphs with improved wrapping
-                    wrapped = textwrap.wrap(
-                        line,
-                        width=MAX_COMMIT_BODY_LENGTH,
-                        replace_whitespace=False,
-                        drop_whitespace=True,
-                        break_long_words=True,  # Changed to True to prevent truncation
-                        break_on_hyphens=True,
-                        expand_tabs=True,
-                        initial_indent='',
-                        subsequent_indent=''
-                    )
-                    
-                    # Preserve empty lines and non-wrapped content
-                    if not wrapped and line.strip():
-                        wrapped = [line.strip()]
-                    wrapped_lines.extend(wrapped)
-            
-            if wrapped_lines:
-                wrapped_paragraphs.append('\n'.join(wrapped_lines))
-        
-        return '\n\n'.join(wrapped_paragraphs)
+        def iter_lines():
+            """Yield wrapped lines, with an empty line between non-empty paragraphs."""
+            emitted = False
+            # Split into paragraphs; runs of blank lines count as one break
+            for paragraph in SECTION_SPLIT(text_block.strip()):
+                separated = not emitted
+                for line in paragraph.strip().splitlines():
+                    list_match = LIST_ITEM_REGEX.match(line)
+                    if list_match:
+                        marker = list_match.group(1)
+                        content = list_match.group(2)
+                        indent = ' ' * (len(marker) + 1)
+                        wrapped = list_item_wrapper(indent).wrap(content)
+                        if wrapped:
+                            wrapped[0] = f"{marker} {wrapped[0]}"
+                            wrapped[1:] = [indent + line for line in wrapped[1:]]
+                    else:
+                        # Handle regular paragraphs with improved wrapping; the wrapper
+                        # only returns nothing for whitespace-only lines, which are dropped
+                        wrapped = PARAGRAPH_WRAPPER.wrap(line)
+
+                    if wrapped and not separated:
+                        yield ''
+                        separated = True
+                    emitted = emitted or bool(wrapped)
+                    yield from wrapped
+
+        return '\n'.join(iter_lines())
 
     @staticmethod
     def _format_footer(text_block: str) -> str:
@@ -215,17 +216,53 @@ class CommitMessage:
         """
         if not text_block:
             return ""
-        paragraphs = text_block.strip().split('\n\n')
+        text_block = text_block.strip()
+        if '\n\n' not in text_block:
+            # Single paragraph (the common case): no list to build and join
+            return CommitMessage._footer_summary_line(text_block)
         summary_parts = []
-        for p in paragraphs:
-            lines = p.strip().split('\n')
-            # Remove bullet points and numbering from each line
-            cleaned_lines = [re.sub(r'^[-*•]\s+|^\d+\.\s+|^[a-zA-Z]\.\s+', '', line.strip()) for line in lines]
-            first_line = next((line for line in cleaned_lines if line), '')
+        for p in text_block.split('\n\n'):
+            first_line = CommitMessage._footer_summary_line(p)
             if first_line:
                 summary_parts.append(first_line)
         return '; '.join(summary_parts)
 
+    @staticmethod
+    def _footer_summary_line(paragraph: str) -> str:
+        """Return the first non-empty line of a footer paragraph without its list marker."""
+        lines = paragraph.strip().splitlines()
+        # Remove bullet points and numbering from each line
+        cleaned_lines = (LEADING_LIST_MARKER('', line) for line in map(str.strip, lines))
+        return next(filter(None, cleaned_lines), '')
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _parse_cached(message: str) -> tuple[str, str, str, bool]:
+        """
+        Validates and formats a non-empty raw message into its sections.
+        Parsing is pure, so repeated messages are served from the cache.
+
+        Returns:
+            tuple[str, str, str, bool]: Title, description, footer and breaking-change flag.
+        """
+        # Split into title, description, and footer
+        parts = SECTION_SPLIT(message.strip(), 2)
+
+        try:
+            validated_title, is_breaking = CommitMessage._validate_and_format_title(parts[0])
+        except CommitMessageError as e:
+            raise CommitMessageError(f"Title validation failed: {e}") from e
+
+        if len(parts) == 1:
+            # Title-only message: nothing to format
+            return validated_title, "", "", is_breaking
+
+        # The sections come from a stripped message split on blank lines,
+        # so they carry no boundary whitespace of their own
+        formatted_description = CommitMessage._format_description(parts[1])
+        formatted_footer = CommitMessage._format_footer(parts[2]) if len(parts) > 2 else ""
+        return validated_title, formatted_description, formatted_footer, is_breaking
+
     @classmethod
     def parse(cls, message: str) -> 'CommitMessage':
         """
@@ -244,26 +281,8 @@ class CommitMessage:
         if not message:
             raise CommitMessageError("Validation error: Commit message cannot be empty.")
 
-        # Split into title, description, and footer
-        parts = message.strip().split('\n\n', 2)
-        raw_title = parts[0]
-
-        try:
-            validated_title, is_breaking = cls._validate_and_format_title(raw_title)
-        except CommitMessageError as e:
-            raise CommitMessageError(f"Title validation failed: {e}") from e
-
-        raw_description = parts[1].strip() if len(parts) > 1 else ""
-        raw_footer = parts[2].strip() if len(parts) > 2 else ""
-
-        formatted_description = cls._format_description(raw_description)
-        formatted_footer = cls._format_footer(raw_footer)
-
-        instance = cls(
-            title=validated_title,
-            description=formatted_description,
-            footer=formatted_footer
-        )
+        title, description, footer, is_breaking = cls._parse_cached(message)
+        instance = cls(title=title, description=description, footer=footer)
         instance.is_breaking_change = is_breaking
 
         return instance
@@ -277,29 +296,20 @@ class CommitMessage:
         Returns:
             str: The commit message with proper section separation and formatting.
         """
-        parts = []
-        
-        # Add title (already validated and formatted)
-        parts.append(self.title)
-        
-        # Add description with opening paragraph if present
+        description = ""
         if self.description:
-            parts.append('')  # Add blank line after title
-            description_parts = self.description.split('\n\n', 1)
-            
+            opening, separator, rest = self.description.partition('\n\n')
             # If description doesn't start with a list item, treat first paragraph as opening
-            if not LIST_ITEM_REGEX.match(description_parts[0]):
-                parts.append(self._format_description(description_parts[0]))
-                parts.append('')  # Always add spacing after opening paragraph
-                if len(description_parts) > 1:
-                    parts.append(self._format_description(description_parts[1]))
+            if not LIST_ITEM_REGEX.match(opening):
+                # Always add spacing after opening paragraph
+                description = self._format_description(opening) + "\n"
+                if separator:
+                    description += "\n" + self._format_description(rest)
             else:
-                # If no opening paragraph, just add the description as is
-                parts.append(self._format_description(self.description))
-        
-        # Add footer with proper formatting
-        if self.footer:
-            parts.append('')  # Ensure blank line before footer
-            parts.append(self._format_description(self.footer))
-        
-        return '\n'.join(parts)
+                description = self._format_description(self.description)
+
+        return (
+            self.title
+            + (f"\n\n{description}" if self.description else "")
+            + (f"\n\n{self._format_description(self.footer)}" if self.footer else "")
+        )
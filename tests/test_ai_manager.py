@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_manager import AIModelManager
+
+
+class ExtractCommitBlockTest(unittest.TestCase):
+    def test_chatty_preamble_is_dropped(self):
+        reply = "Sure! Here is a commit message for your changes:\n\nfeat(api): add pagination\n\nAdds page and size parameters."
+        self.assertEqual(
+            AIModelManager._extract_commit_block(reply),
+            "feat(api): add pagination\n\nAdds page and size parameters.",
+        )
+
+    def test_code_fence_and_trailing_commentary_are_dropped(self):
+        reply = "```\nfix!: reject empty titles\n\nBREAKING CHANGE: empty titles now fail.\n```\nLet me know if you want changes."
+        self.assertEqual(
+            AIModelManager._extract_commit_block(reply),
+            "fix!: reject empty titles\n\nBREAKING CHANGE: empty titles now fail.",
+        )
+
+    def test_language_tagged_fence_is_dropped(self):
+        reply = "```text\ndocs: update readme\n```"
+        self.assertEqual(AIModelManager._extract_commit_block(reply), "docs: update readme")
+
+    def test_reply_without_commit_line_is_only_stripped(self):
+        reply = "  ```I could not determine what changed.```  \n"
+        self.assertEqual(AIModelManager._extract_commit_block(reply), "I could not determine what changed.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from diff_processor import DiffProcessor
+
+
+def make_diff(path, hunk):
+    """Build a single-file unified diff around one hunk body"""
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        "index 1111111..2222222 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        "@@ -1,3 +1,3 @@\n"
+        f"{hunk}"
+    )
+
+
+class ClassifyTrivialWhitespaceTest(unittest.TestCase):
+    def classify(self, hunk, path="app.py"):
+        return DiffProcessor.classify_trivial(make_diff(path, hunk))
+
+    def test_trailing_whitespace_is_trivial(self):
+        message = self.classify(" def f():\n-    return 1   \n+    return 1\n")
+        self.assertIsNotNone(message)
+        self.assertTrue(message.title.startswith("style:"))
+
+    def test_blank_line_changes_are_trivial(self):
+        message = self.classify(" a = 1\n+\n+   \n b = 2\n")
+        self.assertIsNotNone(message)
+        self.assertTrue(message.title.startswith("style:"))
+
+    def test_dedent_out_of_block_is_not_trivial(self):
+        hunk = " if user.is_admin:\n-    delete_everything()\n+delete_everything()\n"
+        self.assertIsNone(self.classify(hunk))
+
+    def test_whitespace_inside_string_is_not_trivial(self):
+        hunk = '-print("hello world")\n+print("helloworld")\n'
+        self.assertIsNone(self.classify(hunk))
+
+    def test_reordered_lines_are_not_trivial(self):
+        hunk = "-a = 1\n b = 2\n+a = 1\n"
+        self.assertIsNone(self.classify(hunk))
+
+    def test_split_line_is_not_trivial(self):
+        hunk = "-x = f(a, b)\n+x = f(a,\n+      b)\n"
+        self.assertIsNone(self.classify(hunk))
+
+
+class ShrinkTest(unittest.TestCase):
+    def test_context_is_trimmed_to_the_outer_lines(self):
+        diff = (
+            "diff --git a/app.py b/app.py\n"
+            "index 1111111..2222222 100644\n"
+            "--- a/app.py\n"
+            "+++ b/app.py\n"
+            "@@ -1,7 +1,7 @@\n"
+            " first\n"
+            " second\n"
+            "-old\n"
+            "+new\n"
+            " middle\n"
+            "+added\n"
+            " before last\n"
+            " last\n"
+        )
+        self.assertEqual(DiffProcessor.shrink(diff), (
+            "diff --git a/app.py b/app.py\n"
+            "--- a/app.py\n"
+            "+++ b/app.py\n"
+            "@@ -1,7 +1,7 @@\n"
+            " first\n"
+            "-old\n"
+            "+new\n"
+            "+added\n"
+            " last\n"
+        ))
+
+    def test_runs_of_blank_changed_lines_collapse(self):
+        shrunk = DiffProcessor.shrink(make_diff("app.py", " a\n+\n+\n+\n+b\n"))
+        self.assertIn(" a\n+\n+b\n", shrunk)
+
+    def test_ignored_files_are_reduced_to_a_note(self):
+        diff = make_diff("dist/bundle.min.js", "-var a=1\n+var a=2\n") + make_diff("app.py", "-a = 1\n+a = 2\n")
+        shrunk = DiffProcessor.shrink(diff)
+        self.assertIn("diff --git a/dist/bundle.min.js b/dist/bundle.min.js\n(generated or vendored file changed", shrunk)
+        self.assertNotIn("var a=2", shrunk)
+        self.assertIn("+a = 2", shrunk)
+
+    def test_lockfiles_are_reduced_to_a_note(self):
+        shrunk = DiffProcessor.shrink(make_diff("web/package-lock.json", '-  "v": 1\n+  "v": 2\n'))
+        self.assertIn("contents omitted", shrunk)
+        self.assertNotIn('"v": 2', shrunk)
+
+    def test_binary_files_are_reduced_to_a_note(self):
+        diff = (
+            "diff --git a/logo.png b/logo.png\n"
+            "index 1111111..2222222 100644\n"
+            "Binary files a/logo.png and b/logo.png differ\n"
+        )
+        self.assertEqual(
+            DiffProcessor.shrink(diff),
+            "diff --git a/logo.png b/logo.png\nBinary file logo.png changed\n",
+        )
+
+    def test_binary_patches_are_reduced_to_a_note(self):
+        diff = (
+            "diff --git a/logo.png b/logo.png\n"
+            "index 1111111..2222222 100644\n"
+            "GIT binary patch\n"
+            "literal 10\n"
+            "Rcmb=0\n"
+        )
+        self.assertEqual(
+            DiffProcessor.shrink(diff),
+            "diff --git a/logo.png b/logo.png\nBinary file logo.png changed\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
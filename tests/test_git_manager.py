@@ -0,0 +1,80 @@
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from git_manager import GitCommitManager
+
+logger = logging.getLogger("test_git_manager")
+logger.addHandler(logging.NullHandler())
+logger.propagate = False
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class GetDiffAndStatsTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._repo = tempfile.TemporaryDirectory()
+        os.chdir(self._repo.name)
+        self.git("init", "-q")
+        self.manager = GitCommitManager(logger)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._repo.cleanup()
+
+    @staticmethod
+    def git(*args):
+        subprocess.run(("git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args), check=True)
+
+    @staticmethod
+    def write(path, data):
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def test_binary_file_is_counted_without_line_stats(self):
+        self.write("logo.bin", b"\x00\x01\x02")
+        self.write("app.py", b"a = 1\nb = 2\n")
+        self.git("add", ".")
+        diff, stats = self.manager.get_diff_and_stats()
+        self.assertEqual(stats, {"files_changed": 2, "insertions": 2, "deletions": 0})
+        self.assertIn("Binary files /dev/null and b/logo.bin differ", diff)
+        self.assertIn("+a = 1", diff)
+
+    def test_rename_with_spaces_in_the_path(self):
+        self.write("old name.txt", b"hello\nworld\n")
+        self.git("add", ".")
+        self.git("commit", "-q", "-m", "init")
+        self.git("mv", "old name.txt", "new name.txt")
+        diff, stats = self.manager.get_diff_and_stats()
+        self.assertEqual(stats, {"files_changed": 1, "insertions": 0, "deletions": 0})
+        self.assertTrue(diff.startswith("diff --git a/old name.txt b/new name.txt"))
+        self.assertIn("rename to new name.txt", diff)
+
+    def test_empty_staged_file(self):
+        self.write("empty.txt", b"")
+        self.git("add", ".")
+        diff, stats = self.manager.get_diff_and_stats()
+        self.assertEqual(stats, {"files_changed": 1, "insertions": 0, "deletions": 0})
+        self.assertTrue(diff.startswith("diff --git a/empty.txt b/empty.txt"))
+
+    def test_nothing_staged(self):
+        diff, stats = self.manager.get_diff_and_stats()
+        self.assertEqual(diff, "")
+        self.assertEqual(stats, {"files_changed": 0, "insertions": 0, "deletions": 0})
+
+
+class ParseStatsTest(unittest.TestCase):
+    def test_sums_numstat_lines(self):
+        manager = GitCommitManager(logger)
+        stats = manager._parse_stats(["3\t1\tapp.py", "-\t-\tlogo.png", "0\t0\told name => new name", ""])
+        self.assertEqual(stats, {"files_changed": 3, "insertions": 3, "deletions": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import CommitMessage, CommitMessageError
+
+
+class ValidateTitleTest(unittest.TestCase):
+    def test_trailing_period_is_removed(self):
+        self.assertEqual(CommitMessage._validate_and_format_title("fix: handle errors."), ("fix: Handle errors", False))
+
+    def test_ellipsis_is_kept(self):
+        self.assertEqual(CommitMessage._validate_and_format_title("fix: wait..."), ("fix: Wait...", False))
+
+    def test_description_of_only_a_period_is_rejected(self):
+        with self.assertRaises(CommitMessageError):
+            CommitMessage._validate_and_format_title("fix: .")
+
+    def test_parse_rejects_description_of_only_a_period(self):
+        with self.assertRaises(CommitMessageError):
+            CommitMessage.parse("fix: .")
+
+
+if __name__ == "__main__":
+    unittest.main()